@@ -1,26 +1,18 @@
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
 import yaml
 from datetime import datetime
 import sqlite3
 import json
+import os
 from pathlib import Path
 import logging
-import traceback
+import threading
+import time
 from contextlib import contextmanager
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image, KeepTogether, PageBreak
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 import io
-import base64
 
 # 新增：导入统一配置加载模块
-from config_loader import config
+from config_loader import config, YAML_LOADER
 
 # 配置日志
 logging.basicConfig(
@@ -32,28 +24,45 @@ logging.basicConfig(
     ]
 )
 
-# 数据库上下文管理器
+# 数据库连接（进程内共享，写操作加锁）
+_db_lock = threading.Lock()
+
+@st.cache_resource(show_spinner=False)
+def _get_conn():
+    """获取共享的数据库连接"""
+    conn = sqlite3.connect('assessment_data.db', check_same_thread=False, isolation_level=None)
+    # WAL模式 + 降低fsync频率，加快提交；连接已缓存，PRAGMA每个进程只执行一次
+    conn.executescript(
+        'PRAGMA journal_mode=WAL;'
+        'PRAGMA synchronous=NORMAL;'
+        'PRAGMA temp_store=MEMORY;'
+        'PRAGMA cache_size=-64000;'
+        'PRAGMA mmap_size=134217728;'
+    )
+    return conn
+
+# 写事务上下文管理器（多条写语句合并为一次提交）
 @contextmanager
-def get_db_connection():
-    conn = None
-    try:
-        conn = sqlite3.connect('assessment_data.db')
-        yield conn
-    except Exception as e:
-        logging.error(f"数据库连接错误: {str(e)}")
-        logging.error(traceback.format_exc())
-        raise
-    finally:
-        if conn:
-            conn.close()
+def db_transaction():
+    conn = _get_conn()
+    with _db_lock:
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+            conn.execute('COMMIT')
+        except Exception:
+            # 提交失败（如SQLITE_BUSY）也要回滚，避免共享连接停留在未结束的事务中
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
 
-# 初始化数据库
+# 初始化数据库（与共享连接一样，每个进程只执行一次）
+@st.cache_resource(show_spinner=False)
 def init_db():
     """初始化数据库"""
     try:
-        with get_db_connection() as conn:
-            c = conn.cursor()
-            c.execute('''
+        with db_transaction() as conn:
+            conn.execute('''
                 CREATE TABLE IF NOT EXISTS assessment_results (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     timestamp TEXT,
@@ -61,52 +70,66 @@ def init_db():
                     sub_responses TEXT
                 )
             ''')
-            conn.commit()
+            # 当前进度单独存放在固定id=1的一行中；旧版本追加的历史记录保留在assessment_results中
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS current_assessment (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    timestamp TEXT,
+                    responses TEXT,
+                    sub_responses TEXT
+                )
+            ''')
         logging.info("数据库初始化成功")
     except Exception as e:
-        logging.error(f"数据库初始化失败: {str(e)}")
-        logging.error(traceback.format_exc())
+        logging.exception("数据库初始化失败: %s", e)
         raise
 
-# 保存评估结果
+# 保存评估结果（原地更新当前进度行；已保存内容与本次相同时不改写该行）
 def save_assessment_results(responses, sub_responses):
     """保存评估结果"""
     try:
-        with get_db_connection() as conn:
-            c = conn.cursor()
-            c.execute('''
-                INSERT INTO assessment_results (timestamp, responses, sub_responses)
-                VALUES (?, ?, ?)
+        with db_transaction() as conn:
+            conn.execute('''
+                INSERT INTO current_assessment (id, timestamp, responses, sub_responses)
+                VALUES (1, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    timestamp = excluded.timestamp,
+                    responses = excluded.responses,
+                    sub_responses = excluded.sub_responses
+                WHERE responses IS NOT excluded.responses
+                    OR sub_responses IS NOT excluded.sub_responses
             ''', (datetime.now().isoformat(), 
-                  json.dumps(responses), 
-                  json.dumps(sub_responses)))
-            conn.commit()
+                  json.dumps(responses, separators=(',', ':')), 
+                  json.dumps(sub_responses, separators=(',', ':'))))
         logging.info("结果保存成功")
     except Exception as e:
-        logging.error(f"保存结果失败: {str(e)}")
-        logging.error(traceback.format_exc())
+        logging.exception("保存结果失败: %s", e)
         raise
 
 # 加载最近的评估结果
 def load_latest_assessment_results():
     """加载最近的评估结果"""
     try:
-        with get_db_connection() as conn:
-            c = conn.cursor()
-            c.execute('''
+        conn = _get_conn()
+        with _db_lock:
+            result = conn.execute('''
                 SELECT responses, sub_responses 
-                FROM assessment_results 
-                ORDER BY timestamp DESC 
-                LIMIT 1
-            ''')
-            result = c.fetchone()
-            
-            if result:
-                return json.loads(result[0]), json.loads(result[1])
-            return {}, {}
+                FROM current_assessment 
+                WHERE id = 1
+            ''').fetchone()
+            if result is None:
+                # 尚未保存过当前进度时，回退到旧版本保存的最后一条记录
+                result = conn.execute('''
+                    SELECT responses, sub_responses 
+                    FROM assessment_results 
+                    ORDER BY id DESC LIMIT 1
+                ''').fetchone()
+        
+        if result:
+            return json.loads(result[0]), json.loads(result[1])
+        return {}, {}
     except Exception as e:
-        logging.error(f"加载结果失败: {str(e)}")
-        logging.error(traceback.format_exc())
+        logging.exception("加载结果失败: %s", e)
         return {}, {}
 
 # 初始化会话状态
@@ -117,48 +140,99 @@ def init_session_state():
     if 'sub_responses' not in st.session_state:
         st.session_state.sub_responses = {}
     if 'last_save_time' not in st.session_state:
-        st.session_state.last_save_time = datetime.now()
+        st.session_state.last_save_time = datetime.now()  # 仅用于显示
+    if 'last_save_mono' not in st.session_state:
+        st.session_state.last_save_mono = time.monotonic()  # 用于自动保存计时
+    if 'dirty' not in st.session_state:
+        st.session_state.dirty = False  # 上次成功保存后作答是否有修改
     if 'force_refresh' not in st.session_state:
         st.session_state.force_refresh = False
     if 'language' not in st.session_state:
         st.session_state.language = 'zh'  # 默认中文
 
-# 加载评估问题
-def load_questionnaire():
+# 计算评估内容哈希（用于判断是否需要保存）
+def get_responses_hash(responses, sub_responses):
+    """计算评估内容哈希"""
+    return hash((tuple(sorted(responses.items())), tuple(sorted(sub_responses.items()))))
+
+# PJ题评分选项标签
+SCORE_LABELS = {
+    'zh': {
+        0: "未实施",
+        1: "初步实施",
+        2: "部分实施",
+        3: "大部分实施",
+        4: "完全实施"
+    },
+    'en': {
+        0: "Not Implemented",
+        1: "Initial Implementation",
+        2: "Partial Implementation",
+        3: "Mostly Implemented",
+        4: "Fully Implemented"
+    }
+}
+
+# XO题是否选项标签
+YES_NO_OPTIONS = {
+    'zh': {0: "否", 4: "是"},
+    'en': {0: "No", 4: "Yes"}
+}
+
+# 题型对应的CSS类名
+QUESTION_TYPE_CLASSES = {
+    "PJ": "question-type-pj",
+    "XO": "question-type-xo",
+    "PW": "question-type-pw"
+}
+
+# 问卷文件路径
+QUESTIONNAIRE_ZH_PATH = 'config/questionnaire.yaml'
+QUESTIONNAIRE_EN_PATH = 'config/questionnaire_en.yaml'
+
+# 英文章节键名到中文章节名的映射
+SECTION_NAME_ZH = {
+    'organization_context': '组织环境',
+    'leadership': '领导作用',
+    'planning': '策划',
+    'support': '支持',
+    'operation': '运行',
+    'performance_evaluation': '绩效评价',
+    'improvement': '改进'
+}
+
+def get_questionnaire_mtimes():
+    """获取问卷文件修改时间（作为缓存键，文件修改后自动重新加载）"""
+    return (os.path.getmtime(QUESTIONNAIRE_ZH_PATH), os.path.getmtime(QUESTIONNAIRE_EN_PATH))
+
+# 加载评估问题（问卷为静态配置，跨重跑缓存）
+@st.cache_data(show_spinner=False)
+def load_questionnaire(mtimes=None):
     """加载问题"""
     try:
         # 加载中文问题
-        with open('config/questionnaire.yaml', 'r', encoding='utf-8') as file:
-            questions_zh = yaml.safe_load(file)
+        with open(QUESTIONNAIRE_ZH_PATH, 'rb') as file:
+            questions_zh = yaml.load(file, Loader=YAML_LOADER)
         
         # 加载英文问题
-        with open('config/questionnaire_en.yaml', 'r', encoding='utf-8') as file:
-            questions_en = yaml.safe_load(file)
+        with open(QUESTIONNAIRE_EN_PATH, 'rb') as file:
+            questions_en = yaml.load(file, Loader=YAML_LOADER)
         
         logging.info("成功加载问题")
         
         # 合并中英文内容
         formatted_questions = {}
         
-        # 创建英文键名到中文键名的映射
-        section_mapping = {
-            'organization_context': '组织环境',
-            'leadership': '领导作用',
-            'planning': '策划',
-            'support': '支持',
-            'operation': '运行',
-            'performance_evaluation': '绩效评价',
-            'improvement': '改进'
-        }
-        
         # 遍历英文问题作为基准
         for section_en, section_data_en in questions_en.items():
-            section_zh = section_mapping.get(section_en)
+            section_zh = SECTION_NAME_ZH.get(section_en)
             if not section_zh:
                 logging.warning(f"找不到章节 '{section_en}' 的中文映射")
                 continue
                 
             section_zh_data = questions_zh.get(section_zh, {})
+            # 题目权重在加载时写入问题数据，计分与报告直接读取
+            question_weights = config.score_weights['question_weights'].get(section_en, {})
             
             formatted_questions[section_en] = {
                 'id': section_en,
@@ -174,6 +248,8 @@ def load_questionnaire():
                 
                 formatted_question = {
                     'type': q_data_en['type'],
+                    'type_class': QUESTION_TYPE_CLASSES.get(q_data_en['type'], ""),
+                    'weight': question_weights.get(q_id, 1),
                     'description': {
                         'en': q_data_en['description'],
                         'zh': q_data_zh.get('description', q_data_en['description'])  # 如果没有中文描述，使用英文
@@ -186,13 +262,16 @@ def load_questionnaire():
                         'en': q_data_en['sub_questions'],
                         'zh': q_data_zh.get('sub_questions', q_data_en['sub_questions'])  # 如果没有中文子问题，使用英文
                     }
+                    # 预先计算每个子项的分值及子问题回答键（键格式：{section}_{q_id}_sub_{i}）
+                    sub_count = len(q_data_en['sub_questions'])
+                    formatted_question['sub_weight'] = formatted_question['weight'] / sub_count if sub_count else 0
+                    formatted_question['sub_keys'] = [f"{section_en}_{q_id}_sub_{i}" for i in range(1, sub_count + 1)]
                 
                 formatted_questions[section_en]['questions'][q_id] = formatted_question
         
         return formatted_questions
     except Exception as e:
-        logging.error(f"加载问题失败: {str(e)}")
-        logging.error(traceback.format_exc())
+        logging.exception("加载问题失败: %s", e)
         raise
 
 # 加载分值权重配置
@@ -206,8 +285,7 @@ def calculate_compliance_score(responses, question_type, sub_responses=None, sco
             if not sub_responses:
                 return 0
             # 直接用True/False算平均
-            sub_scores = [100 if v else 0 for v in sub_responses.values()]
-            base_score = sum(sub_scores) / len(sub_scores) if sub_scores else 0
+            base_score = sum(1 for v in sub_responses.values() if v) * 100 / len(sub_responses)
         else:
             if not responses:
                 return 0
@@ -219,8 +297,7 @@ def calculate_compliance_score(responses, question_type, sub_responses=None, sco
         weighted_score = (base_score / 100) * score_weight
         return weighted_score
     except Exception as e:
-        logging.error(f"计算合规分数失败: {str(e)}")
-        logging.error(traceback.format_exc())
+        logging.exception("计算合规分数失败: %s", e)
         return 0
 
 # 计算总分（1000分制）
@@ -232,13 +309,58 @@ def calculate_total_score(section_scores):
         # 直接返回所有章节得分之和
         return sum(section_scores.values())
     except Exception as e:
-        logging.error(f"计算总分失败: {str(e)}")
-        logging.error(traceback.format_exc())
+        logging.exception("计算总分失败: %s", e)
         return 0
 
-# 生成雷达图
-def create_radar_chart(section_scores):
+# 计算各要素得分及各问题实际得分（问卷不参与哈希，以文件修改时间作为缓存键；限制条目数以约束各会话回答带来的内存占用）
+@st.cache_data(max_entries=64, show_spinner=False)
+def compute_scores(_questionnaire, questionnaire_mtimes, responses, sub_responses):
+    """计算各要素得分及各问题得分"""
+    try:
+        section_scores = {}
+        question_scores = {}
+        # 按要素一次性分组（键格式：{section}_{q_id}）
+        responses_by_section = {}
+        for k, v in responses.items():
+            responses_by_section.setdefault(k.rsplit('_', 1)[0], {})[k] = v
+        for section in _questionnaire.keys():
+            section_responses = responses_by_section.get(section, {})
+            
+            # 计算每个问题的得分
+            section_total = 0.0
+            questions = _questionnaire[section].get('questions', {})
+            for q_id, question in questions.items():
+                key = f"{section}_{q_id}"
+                weight = question["weight"]
+                if question["type"] == "PW":
+                    # 子项分值与子问题回答键已在加载问卷时计算
+                    selected_count = sum(1 for sub_key in question.get('sub_keys', ()) if sub_responses.get(sub_key))
+                    score = question.get('sub_weight', 0) * selected_count
+                elif key in section_responses:
+                    score = calculate_compliance_score(
+                        section_responses[key],
+                        question["type"],
+                        None,
+                        score_weight=weight
+                    )
+                else:
+                    score = 0
+                question_scores[key] = score
+                section_total += score
+            
+            # 计算要素总分（由平均分改为总和）
+            section_scores[section] = section_total
+        return section_scores, question_scores
+    except Exception as e:
+        logging.exception("计算得分失败: %s", e)
+        raise
+
+# 生成雷达图（按得分与语言缓存）
+@st.cache_data(show_spinner=False)
+def create_radar_chart(section_scores, language):
     """生成雷达图"""
+    import plotly.graph_objects as go
+    
     try:
         if not section_scores:
             return None
@@ -247,15 +369,7 @@ def create_radar_chart(section_scores):
         categories = []
         values = []
         for section, score in section_scores.items():
-            section_name = section.replace('_', ' ').title() if st.session_state.language == 'en' else {
-                'organization_context': '组织环境',
-                'leadership': '领导作用',
-                'planning': '策划',
-                'support': '支持',
-                'operation': '运行',
-                'performance_evaluation': '绩效评价',
-                'improvement': '改进'
-            }.get(section, section)
+            section_name = section.replace('_', ' ').title() if language == 'en' else SECTION_NAME_ZH.get(section, section)
             categories.append(section_name)
             max_score = section_weights.get(section, 100)
             # 满分显示100，否则按百分比
@@ -266,7 +380,7 @@ def create_radar_chart(section_scores):
             r=values,
             theta=categories,
             fill='toself',
-            name='Compliance Score' if st.session_state.language == 'en' else '合规分数',
+            name='Compliance Score' if language == 'en' else '合规分数',
             line_color='#4CAF50'
         ))
         fig.update_layout(
@@ -290,30 +404,141 @@ def create_radar_chart(section_scores):
         )
         return fig
     except Exception as e:
-        logging.error(f"生成雷达图失败: {str(e)}")
-        logging.error(traceback.format_exc())
+        logging.exception("生成雷达图失败: %s", e)
+        return None
+
+# 渲染雷达图PNG（Kaleido渲染开销大，按得分与语言缓存）
+@st.cache_data(show_spinner=False)
+def _radar_png(score_items, language):
+    """渲染雷达图图片"""
+    radar_chart = create_radar_chart(dict(score_items), language)
+    if radar_chart is None:
         return None
+    return radar_chart.to_image(format="png")
+
+# PDF中文字体文件路径
+FONT_DIR = Path(__file__).parent / "fonts"
+SIMSUN_PATH = str(FONT_DIR / "simsun.ttc")
+SIMHEI_PATH = str(FONT_DIR / "simhei.ttf")
+
+# 注册PDF中文字体（每个进程只解析一次字体文件）
+@st.cache_resource(show_spinner=False)
+def _register_fonts():
+    """注册PDF字体，返回是否注册成功"""
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+    
+    try:
+        pdfmetrics.registerFont(TTFont('SimSun', SIMSUN_PATH))
+        pdfmetrics.registerFont(TTFont('SimHei', SIMHEI_PATH))
+        return True
+    except Exception as e:
+        logging.warning("注册PDF字体失败，使用Helvetica: %s", e)
+        return False
+
+# 构建PDF段落样式（每种语言只构建一次）
+@st.cache_resource(show_spinner=False)
+def _get_pdf_styles(language):
+    """获取PDF字体与段落样式"""
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    
+    if _register_fonts():
+        main_font = config.general['font_zh'] if language == 'zh' else config.general['font_en']
+        bold_font = config.general['font_zh_bold'] if language == 'zh' else config.general['font_en_bold']
+    else:
+        main_font = 'Helvetica'
+        bold_font = 'Helvetica-Bold'
+
+    styles = getSampleStyleSheet()
+
+    # 创建自定义样式
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontName=bold_font,
+        fontSize=28,
+        spaceAfter=30,
+        alignment=1,
+        textColor=colors.HexColor('#2E4053')
+    )
+
+    heading2_style = ParagraphStyle(
+        'CustomHeading2',
+        parent=styles['Heading2'],
+        fontName=bold_font,
+        fontSize=20,
+        spaceAfter=15,
+        textColor=colors.HexColor('#2874A6')
+    )
+
+    heading3_style = ParagraphStyle(
+        'CustomHeading3',
+        parent=styles['Heading3'],
+        fontName=bold_font,
+        fontSize=16,
+        spaceAfter=12,
+        textColor=colors.HexColor('#3498DB')
+    )
+
+    normal_style = ParagraphStyle(
+        'CustomNormal',
+        parent=styles['Normal'],
+        fontName=main_font,
+        fontSize=12,
+        spaceAfter=8,
+        leading=16,
+        textColor=colors.black
+    )
+
+    score_style = ParagraphStyle(
+        'ScoreStyle',
+        parent=heading2_style,
+        fontSize=24,
+        textColor=colors.HexColor('#27AE60')
+    )
 
-def create_pdf_report(section_scores, questionnaire, responses, sub_responses):
+    # 问题样式（所有问题共用）
+    question_style = ParagraphStyle(
+        'QuestionStyle',
+        parent=normal_style,
+        fontSize=13,
+        textColor=colors.HexColor('#2C3E50'),
+        spaceAfter=5
+    )
+
+    return {
+        'title': title_style,
+        'h2': heading2_style,
+        'h3': heading3_style,
+        'normal': normal_style,
+        'score': score_style,
+        'question': question_style,
+        'main_font': main_font,
+        'bold_font': bold_font
+    }
+
+def create_pdf_report(section_scores, question_scores, total_score, questionnaire, responses, sub_responses):
     """生成PDF报告"""
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image, KeepTogether, PageBreak
+    
     try:
         if not section_scores or not questionnaire:
             logging.error("生成PDF报告失败：缺少必要数据")
             return None
             
-        # 使用系统字体
-        font_dir = Path(__file__).parent / "fonts"
-        simsun_path = font_dir / "simsun.ttc"
-        simhei_path = font_dir / "simhei.ttf"
-
-        try:
-            pdfmetrics.registerFont(TTFont('SimSun', str(simsun_path)))
-            pdfmetrics.registerFont(TTFont('SimHei', str(simhei_path)))
-            main_font = config.general['font_zh'] if st.session_state.language == 'zh' else config.general['font_en']
-            bold_font = config.general['font_zh_bold'] if st.session_state.language == 'zh' else config.general['font_en_bold']
-        except Exception as e:
-            main_font = 'Helvetica'
-            bold_font = 'Helvetica-Bold'
+        # 获取缓存的字体与样式
+        pdf_styles = _get_pdf_styles(st.session_state.language)
+        main_font = pdf_styles['main_font']
+        bold_font = pdf_styles['bold_font']
+        title_style = pdf_styles['title']
+        heading2_style = pdf_styles['h2']
+        heading3_style = pdf_styles['h3']
+        normal_style = pdf_styles['normal']
+        question_style = pdf_styles['question']
         
         # 创建PDF文档
         buffer = io.BytesIO()
@@ -322,82 +547,35 @@ def create_pdf_report(section_scores, questionnaire, responses, sub_responses):
                               rightMargin=50,
                               topMargin=50,
                               bottomMargin=50)
-        styles = getSampleStyleSheet()
-        
-        # 创建自定义样式
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontName=bold_font,
-            fontSize=28,
-            spaceAfter=30,
-            alignment=1,
-            textColor=colors.HexColor('#2E4053')
-        )
-        
-        heading2_style = ParagraphStyle(
-            'CustomHeading2',
-            parent=styles['Heading2'],
-            fontName=bold_font,
-            fontSize=20,
-            spaceAfter=15,
-            textColor=colors.HexColor('#2874A6')
-        )
-        
-        heading3_style = ParagraphStyle(
-            'CustomHeading3',
-            parent=styles['Heading3'],
-            fontName=bold_font,
-            fontSize=16,
-            spaceAfter=12,
-            textColor=colors.HexColor('#3498DB')
-        )
-        
-        normal_style = ParagraphStyle(
-            'CustomNormal',
-            parent=styles['Normal'],
-            fontName=main_font,
-            fontSize=12,
-            spaceAfter=8,
-            leading=16,
-            textColor=colors.black
-        )
         
         elements = []
         
         # 添加标题
-        title = config.lang_zh['app_title'] if st.session_state.language == 'zh' else config.lang_en['app_title']
+        title = t('app_title')
         # 组合第一页内容
         first_page_content = []
         first_page_content.append(Paragraph(title, title_style))
         # 总体评分
-        total_score = sum(section_scores.values()) if section_scores else 0
-        score_style = ParagraphStyle(
-            'ScoreStyle',
-            parent=heading2_style,
-            fontSize=24,
-            textColor=colors.HexColor('#27AE60')
-        )
-        overall_score = config.lang_zh['overall_score'] if st.session_state.language == 'zh' else config.lang_en['overall_score']
+        score_style = pdf_styles['score']
+        overall_score = t('overall_score')
         first_page_content.append(Paragraph(f"{overall_score}{total_score:.1f}", score_style))
         first_page_content.append(Spacer(1, 10))
         # 雷达图
-        radar_chart = create_radar_chart(section_scores)
-        if radar_chart:
-            try:
-                img_data = radar_chart.to_image(format="png")
+        try:
+            img_data = _radar_png(tuple(section_scores.items()), st.session_state.language)
+            if img_data:
                 img = Image(io.BytesIO(img_data), width=6.8*inch, height=5.0*inch)  # 宽高
                 first_page_content.append(img)
                 first_page_content.append(Spacer(1, 10))
-            except Exception as e:
-                logging.error(f"添加雷达图到PDF失败: {str(e)}")
+        except Exception as e:
+            logging.error("添加雷达图到PDF失败: %s", e)
         # 各要素得分详情表格
         first_page_content.append(Paragraph(
-            config.lang_zh['element_scores_detail'] if st.session_state.language == 'zh' else config.lang_en['element_scores_detail'],
+            t('element_scores_detail'),
             heading2_style
         ))
         first_page_content.append(Spacer(1, 5))
-        headers = [config.lang_zh['element'] if st.session_state.language == 'zh' else config.lang_en['element'], config.lang_zh['score'] if st.session_state.language == 'zh' else config.lang_en['score']]
+        headers = [t('element'), t('score')]
         data = [headers]
         for section, score in section_scores.items():
             section_id = questionnaire[section]['name']['zh'] if st.session_state.language == 'zh' else questionnaire[section]['name']['en']
@@ -430,98 +608,49 @@ def create_pdf_report(section_scores, questionnaire, responses, sub_responses):
         
         # 添加详细评估结果
         elements.append(Paragraph(
-            config.lang_zh['detailed_assessment_results'] if st.session_state.language == 'zh' else config.lang_en['detailed_assessment_results'],
+            t('detailed_assessment_results'),
             heading2_style
         ))
         elements.append(Spacer(1, 15))
         
-        score_labels = {
-            'zh': {
-                0: "未实施",
-                1: "初步实施",
-                2: "部分实施",
-                3: "大部分实施",
-                4: "完全实施"
-            },
-            'en': {
-                0: "Not Implemented",
-                1: "Initial Implementation",
-                2: "Partial Implementation",
-                3: "Mostly Implemented",
-                4: "Fully Implemented"
-            }
-        }
-        
         for section, section_data in questionnaire.items():
             section_id = section_data['name']['zh'] if st.session_state.language == 'zh' else section_data.get('id', section)
             elements.append(Paragraph(section_id, heading3_style))
             
             for q_id, question in section_data.get('questions', {}).items():
                 key = f"{section}_{q_id}"
-                score = responses.get(key, 0)
-                question_weight = score_weights_config['question_weights'][section].get(q_id, 1)
-                # 计算实际得分
-                if question['type'] == "XO":
-                    actual_score = question_weight if score == 4 else 0
-                elif question['type'] == "PJ":
-                    actual_score = question_weight * (score / 4)
-                elif question['type'] == "PW":
-                    # 重新计算PW题的得分
-                    sub_questions = question.get("sub_questions", {}).get(st.session_state.language, [])
-                    sub_count = len(sub_questions)
-                    selected_count = 0
-                    for i in range(1, sub_count + 1):
-                        sub_key = f"{key}_sub_{i}"
-                        if st.session_state.sub_responses.get(sub_key, False):
-                            selected_count += 1
-                    actual_score = (question_weight / sub_count) * selected_count if sub_count else 0
-                else:
-                    actual_score = score
-                # 创建问题样式
-                question_style = ParagraphStyle(
-                    'QuestionStyle',
-                    parent=normal_style,
-                    fontSize=13,
-                    textColor=colors.HexColor('#2C3E50'),
-                    spaceAfter=5
-                )
-                # 创建得分样式
-                score_style = ParagraphStyle(
-                    'ScoreStyle',
-                    parent=normal_style,
-                    fontSize=12,
-                    textColor=colors.HexColor('#E74C3C'),
-                    spaceAfter=8
-                )
+                question_weight = question['weight']
+                actual_score = question_scores.get(key, 0)
                 # 添加问题描述和得分
-                question_text = config.lang_zh['question'] if st.session_state.language == 'zh' else config.lang_en['question']
-                type_text = config.lang_zh['type'] if st.session_state.language == 'zh' else config.lang_en['type']
-                score_text = config.lang_zh['score'] if st.session_state.language == 'zh' else config.lang_en['score']
-                weight_text = config.lang_zh['weight'] if st.session_state.language == 'zh' else config.lang_en['weight']
+                question_text = t('question')
+                type_text = t('type')
+                score_text = t('score')
+                weight_text = t('weight')
                 description = get_translated_text(question["description"], st.session_state.language)
                 elements.append(Paragraph(f"{question_text}{description}", question_style))
-                elements.append(Paragraph(f"{type_text}{question['type']}", normal_style))
-                elements.append(Paragraph(f"{score_text}{actual_score:.1f}", score_style))
-                elements.append(Paragraph(f"{weight_text}{question_weight}", normal_style))
+                # 类型、得分、权重合并为一个段落（减少版面元素数量）
+                elements.append(Paragraph(
+                    f"{type_text}{question['type']}<br/>"
+                    f'<font color="#E74C3C">{score_text}{actual_score:.1f}</font><br/>'
+                    f"{weight_text}{question_weight}",
+                    normal_style
+                ))
                 
                 # 如果是多选题，添加子问题得分
                 if question['type'] == "PW" and "sub_questions" in question:
-                    sub_questions = question["sub_questions"].get(st.session_state.language, [])
-                    sub_scores_text = config.lang_zh['sub_question_scores'] if st.session_state.language == 'zh' else config.lang_en['sub_question_scores']
-                    elements.append(Paragraph(sub_scores_text, normal_style))
-                    sub_count = len(sub_questions)
-                    question_weight = score_weights_config['question_weights'][section].get(q_id, 1)
-                    for i, sub_q in enumerate(sub_questions, 1):
-                        sub_key = f"{key}_sub_{i}"
-                        sub_score = st.session_state.sub_responses.get(sub_key, False)
-                        yes_text = config.lang_zh['answer_yes'] if st.session_state.language == 'zh' else config.lang_en['answer_yes']
-                        no_text = config.lang_zh['answer_no'] if st.session_state.language == 'zh' else config.lang_en['answer_no']
+                    sub_scores_text = t('sub_question_scores')
+                    sub_lines = [sub_scores_text]
+                    yes_text = t('answer_yes')
+                    no_text = t('answer_no')
+                    for sub_key, sub_q in zip(question['sub_keys'], question['sub_questions'][st.session_state.language]):
+                        sub_score = sub_responses.get(sub_key, False)
                         # 子问题得分为题目权重/子项数
-                        sub_score_value = question_weight / sub_count if sub_score else 0
+                        sub_score_value = question['sub_weight'] if sub_score else 0
                         if st.session_state.language == 'en':
-                            elements.append(Paragraph(f"- {sub_q}: {yes_text if sub_score else no_text} ({sub_score_value:.1f})", normal_style))
+                            sub_lines.append(f"- {sub_q}: {yes_text if sub_score else no_text} ({sub_score_value:.1f})")
                         else:
-                            elements.append(Paragraph(f"- {sub_q}: {yes_text if sub_score else no_text}（{sub_score_value:.1f}）", normal_style))
+                            sub_lines.append(f"- {sub_q}: {yes_text if sub_score else no_text}（{sub_score_value:.1f}）")
+                    elements.append(Paragraph("<br/>".join(sub_lines), normal_style))
                 
                 elements.append(Spacer(1, 15))
         
@@ -530,10 +659,58 @@ def create_pdf_report(section_scores, questionnaire, responses, sub_responses):
         buffer.seek(0)
         return buffer
     except Exception as e:
-        logging.error(f"生成PDF报告失败: {str(e)}")
-        logging.error(traceback.format_exc())
+        logging.exception("生成PDF报告失败: %s", e)
         return None
 
+# 生成Excel报告
+def create_excel_report(section_scores, question_scores, questionnaire, responses, sub_responses):
+    """生成Excel报告"""
+    from openpyxl import Workbook
+    
+    # 创建报告数据
+    lang = st.session_state.language
+    yes_text = t('answer_yes')
+    no_text = t('answer_no')
+    report_rows = []
+    for section, section_data in questionnaire.items():
+        section_id = section_data.get('id', section)
+        for q_id, question in section_data.get('questions', {}).items():
+            key = f"{section}_{q_id}"
+            score = responses.get(key, 0)
+            actual_score = question_scores.get(key, 0)
+            # 获取子问题得分（如果是多选题），每个子问题一行；子问题回答键已在加载问卷时生成
+            sub_scores = []
+            if question["type"] == "PW" and "sub_questions" in question:
+                for sub_key, sub_q in zip(question['sub_keys'], question['sub_questions'][lang]):
+                    sub_scores.append(f"{sub_q}: {yes_text if sub_responses.get(sub_key, False) else no_text}")
+            report_rows.append([
+                section_id,
+                question["type"],
+                question['description'][lang],
+                actual_score,
+                SCORE_LABELS[lang][round(score)] if question["type"] != "XO" else
+                    YES_NO_OPTIONS[lang][4 if score == 4 else 0],
+                question["weight"],
+                "\n".join(sub_scores) if sub_scores else None
+            ])
+    
+    # 直接用openpyxl导出为Excel，只写模式逐行写入，不在内存中保留单元格对象
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(t('assessment_results'))
+    worksheet.append(["element", "question_type", "question", "score", "assessment", "weight", "sub_scores"])
+    for row in report_rows:
+        worksheet.append(row)
+    
+    # 创建雷达图数据工作表
+    radar_worksheet = workbook.create_sheet(t('radar_chart_data'))
+    radar_worksheet.append([t('element'), t('score')])
+    for section, section_score in section_scores.items():
+        radar_worksheet.append([section, f"{section_score:.1f}"])
+    
+    excel_buffer = io.BytesIO()
+    workbook.save(excel_buffer)
+    return excel_buffer.getvalue()
+
 # 初始化数据库
 init_db()
 
@@ -546,8 +723,12 @@ st.set_page_config(
 )
 
 # 加载外部CSS文件
-with open('style.css', encoding='utf-8') as f:
-    st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
+@st.cache_data
+def _load_css():
+    """读取样式表"""
+    return Path('style.css').read_text(encoding='utf-8')
+
+st.markdown(f'<style>{_load_css()}</style>', unsafe_allow_html=True)
 
 def get_translated_text(text_dict, lang='zh'):
     """获取翻译文本"""
@@ -557,6 +738,13 @@ def get_translated_text(text_dict, lang='zh'):
         return text_dict.get(lang, text_dict.get('zh', ''))
     return ''
 
+# 界面文本（按语言索引的配置）
+LANG_TEXTS = {'zh': config.lang_zh, 'en': config.lang_en}
+
+def t(key):
+    """获取当前语言的界面文本"""
+    return LANG_TEXTS[st.session_state.language][key]
+
 def get_section_title(section_data, lang='zh'):
     """获取章节标题"""
     name = get_translated_text(section_data.get('name', section_data.get('id', '')), lang)
@@ -573,58 +761,80 @@ def main():
         
         # 加载评估问题
         try:
-            questionnaire = load_questionnaire()
+            questionnaire_mtimes = get_questionnaire_mtimes()
+            questionnaire = load_questionnaire(questionnaire_mtimes)
         except Exception as e:
             st.error(f"加载评估问题时出错: {str(e)}")
             return
+        # 当前语言下的要素名称（侧边栏与结果分析共用）
+        section_names = {section: get_translated_text(section_data.get('name', section), st.session_state.language) for section, section_data in questionnaire.items()}
 
         # 添加侧边栏
         with st.sidebar:
             # 简化语言切换为两个按钮
             col1, col2 = st.columns(2)
             with col1:
-                if st.button(config.lang_zh['zh_button'] if st.session_state.language == 'zh' else config.lang_en['zh_button'], type="primary" if st.session_state.language == 'zh' else "secondary"):
+                if st.button(t('zh_button'), type="primary" if st.session_state.language == 'zh' else "secondary"):
                     st.session_state.language = 'zh'
                     st.rerun()
             with col2:
-                if st.button(config.lang_zh['en_button'] if st.session_state.language == 'en' else config.lang_en['en_button'], type="primary" if st.session_state.language == 'en' else "secondary"):
+                if st.button(t('en_button'), type="primary" if st.session_state.language == 'en' else "secondary"):
                     st.session_state.language = 'en'
                     st.rerun()
             
             # 添加标题
-            st.title(config.lang_zh['app_title'] if st.session_state.language == 'zh' else config.lang_en['app_title'])
+            st.title(t('app_title'))
             
             st.markdown("---")
             
             # 添加保存和加载按钮
             col1, col2 = st.columns(2)
             with col1:
-                save_text = config.lang_zh['save_progress'] if st.session_state.language == 'zh' else config.lang_en['save_progress']
+                save_text = t('save_progress')
                 if st.button(save_text, key="save_button"):
                     try:
+                        # 进度行由所有会话共享，不能只凭本会话的哈希跳过；与库中内容相同时由SQL跳过改写
                         save_assessment_results(st.session_state.responses, st.session_state.sub_responses)
+                        st.session_state.last_saved_hash = get_responses_hash(st.session_state.responses, st.session_state.sub_responses)
+                        st.session_state.dirty = False
                         st.session_state.last_save_time = datetime.now()
-                        st.success(config.lang_zh['progress_saved'] if st.session_state.language == 'zh' else config.lang_en['progress_saved'])
+                        st.session_state.last_save_mono = time.monotonic()
+                        st.success(t('progress_saved'))
                     except Exception as e:
-                        st.error(f"{config.lang_zh['error_saving_progress']} {str(e)}" if st.session_state.language == 'zh' else f"{config.lang_en['error_saving_progress']} {str(e)}")
+                        st.error(f"{t('error_saving_progress')} {str(e)}")
             
             with col2:
-                load_text = config.lang_zh['load_progress'] if st.session_state.language == 'zh' else config.lang_en['load_progress']
+                load_text = t('load_progress')
                 if st.button(load_text, key="load_button"):
                     try:
                         responses, sub_responses = load_latest_assessment_results()
                         st.session_state.responses = responses
                         st.session_state.sub_responses = sub_responses
+                        st.session_state.last_saved_hash = get_responses_hash(responses, sub_responses)
+                        st.session_state.dirty = False
                         st.session_state.force_refresh = True
-                        st.success(config.lang_zh['last_progress_loaded'] if st.session_state.language == 'zh' else config.lang_en['last_progress_loaded'])
+                        st.success(t('last_progress_loaded'))
                         st.rerun()
                     except Exception as e:
-                        st.error(f"{config.lang_zh['error_loading_progress']} {str(e)}" if st.session_state.language == 'zh' else f"{config.lang_en['error_loading_progress']} {str(e)}")
+                        st.error(f"{t('error_loading_progress')} {str(e)}")
             
             # 显示上次保存时间
-            last_save_text = config.lang_zh['last_saved'] if st.session_state.language == 'zh' else config.lang_en['last_saved']
+            last_save_text = t('last_saved')
             st.markdown(f"{last_save_text}{st.session_state.last_save_time.strftime('%Y-%m-%d %H:%M:%S')}")
             
+            st.markdown("---")
+            # 选择当前评估要素（评估页只渲染所选要素的控件）
+            # 标签和选项文本随语言变化会生成新的控件（旧控件状态随之清除），
+            # 因此所选要素另存于非控件键open_section，并作为index传入，避免切换语言后跳回第一个要素
+            section_keys = list(questionnaire.keys())
+            open_section = st.session_state.get('open_section')
+            st.session_state.open_section = st.selectbox(
+                t('current_element'),
+                options=section_keys,
+                index=section_keys.index(open_section) if open_section in section_keys else 0,
+                format_func=section_names.__getitem__
+            )
+            
             st.markdown("---")
             if st.session_state.language == 'en':
                 st.markdown("""
@@ -642,27 +852,27 @@ def main():
                 """)
 
         # 创建选项卡
-        tab_titles = [config.lang_zh['system_assessment'] if st.session_state.language == 'zh' else config.lang_en['system_assessment'], config.lang_zh['result_analysis'] if st.session_state.language == 'zh' else config.lang_en['result_analysis'], config.lang_zh['report_export'] if st.session_state.language == 'zh' else config.lang_en['report_export']]
+        tab_titles = [t('system_assessment'), t('result_analysis'), t('report_export')]
         tabs = st.tabs(tab_titles)
         
         # 评估标签页
         with tabs[0]:
             try:
+                # 本地引用会话状态中的回答字典，减少循环内的session_state属性查找
+                responses = st.session_state.responses
+                sub_responses = st.session_state.sub_responses
                 for section, section_data in questionnaire.items():
+                    # 只渲染侧边栏选中的要素，已作答内容保存在session_state中
+                    if section != st.session_state.open_section:
+                        continue
                     with st.expander(get_section_title(section_data, st.session_state.language), expanded=True):
                         for q_id, question in section_data.get('questions', {}).items():
                             key = f"{section}_{q_id}"
                             col1, col2 = st.columns([3, 1])
                             with col1:
-                                type_class = {
-                                    "PJ": "question-type-pj",
-                                    "XO": "question-type-xo",
-                                    "PW": "question-type-pw"
-                                }.get(question["type"], "")
-                                
-                                description = get_translated_text(question.get('description', {}), st.session_state.language)
+                                description = question['description'][st.session_state.language]
                                 st.markdown(
-                                    f'<span class="question-type {type_class}">{question["type"]}</span>'
+                                    f'<span class="question-type {question["type_class"]}">{question["type"]}</span>'
                                     f'<span style="font-weight: bold;">{description}</span>',
                                     unsafe_allow_html=True
                                 )
@@ -670,39 +880,22 @@ def main():
                             with col2:
                                 if question["type"] == "XO":
                                     # 是否题使用单选框
-                                    current_value = st.session_state.responses.get(key, 0)
-                                    yes_no_options = {
-                                        'zh': {0: "否", 4: "是"},
-                                        'en': {0: "No", 4: "Yes"}
-                                    }
-                                    st.session_state.responses[key] = st.radio(
-                                        config.lang_zh['score'] if st.session_state.language == 'zh' else config.lang_en['score'],
+                                    current_value = responses.get(key, 0)
+                                    value = st.radio(
+                                        t('score'),
                                         options=[0, 4],
-                                        format_func=lambda x: yes_no_options[st.session_state.language][x],
+                                        format_func=YES_NO_OPTIONS[st.session_state.language].__getitem__,
                                         horizontal=True,
                                         key=f"radio_{section}_{q_id}",
                                         label_visibility="collapsed",
                                         index=1 if current_value == 4 else 0
                                     )
+                                    if value != current_value:
+                                        st.session_state.dirty = True
+                                    responses[key] = value
                                 elif question["type"] == "PJ":
                                     # 主观判断题使用下拉框
-                                    current_value = st.session_state.responses.get(key, 0)
-                                    score_labels = {
-                                        'zh': {
-                                            0: "未实施",
-                                            1: "初步实施",
-                                            2: "部分实施",
-                                            3: "大部分实施",
-                                            4: "完全实施"
-                                        },
-                                        'en': {
-                                            0: "Not Implemented",
-                                            1: "Initial Implementation",
-                                            2: "Partial Implementation",
-                                            3: "Mostly Implemented",
-                                            4: "Fully Implemented"
-                                        }
-                                    }
+                                    current_value = responses.get(key, 0)
                                     # 修正index越界问题
                                     index = 0
                                     try:
@@ -711,245 +904,160 @@ def main():
                                             index = 0
                                     except Exception:
                                         index = 0
-                                    st.session_state.responses[key] = st.selectbox(
-                                        config.lang_zh['score'] if st.session_state.language == 'zh' else config.lang_en['score'],
+                                    value = st.selectbox(
+                                        t('score'),
                                         options=[0, 1, 2, 3, 4],
-                                        format_func=lambda x: score_labels[st.session_state.language][x],
+                                        format_func=SCORE_LABELS[st.session_state.language].__getitem__,
                                         key=f"select_{section}_{q_id}",
                                         label_visibility="collapsed",
                                         index=index  # 保证index合法
                                     )
+                                    if value != current_value:
+                                        st.session_state.dirty = True
+                                    responses[key] = value
                                 else:  # PW类型
                                     # 多选题使用复选框
                                     if "sub_questions" in question:
                                         sub_questions = question.get('sub_questions', {}).get(st.session_state.language, [])
                                         for i, sub_q in enumerate(sub_questions, 1):
                                             sub_key = f"{key}_sub_{i}"
-                                            if sub_key not in st.session_state.sub_responses:
-                                                st.session_state.sub_responses[sub_key] = False
                                             checked = st.checkbox(
                                                 sub_q,
-                                                value=st.session_state.sub_responses.get(sub_key, False),
+                                                value=sub_responses.get(sub_key, False),
                                                 key=f"checkbox_{section}_{q_id}_{i}_sub"
                                             )
-                                            st.session_state.sub_responses[sub_key] = checked
+                                            if checked != sub_responses.get(sub_key, False):
+                                                st.session_state.dirty = True
+                                            sub_responses[sub_key] = checked
                                         # 不再赋值st.session_state.responses[key]
                 
-                # 自动保存功能
-                current_time = datetime.now()
-                if (current_time - st.session_state.last_save_time).total_seconds() > 300:  # 每5分钟自动保存一次
+                # 自动保存功能（仅在作答有修改时检查）
+                if st.session_state.dirty and time.monotonic() - st.session_state.last_save_mono > 300:  # 每5分钟自动保存一次
                     try:
-                        save_assessment_results(st.session_state.responses, st.session_state.sub_responses)
-                        st.session_state.last_save_time = current_time
-                        auto_save_text = config.lang_zh['progress_auto_saved'] if st.session_state.language == 'zh' else config.lang_en['progress_auto_saved']
-                        st.toast(auto_save_text, icon="💾")
+                        # 内容未变化时跳过保存
+                        state_hash = get_responses_hash(st.session_state.responses, st.session_state.sub_responses)
+                        if state_hash != st.session_state.get('last_saved_hash'):
+                            save_assessment_results(st.session_state.responses, st.session_state.sub_responses)
+                            st.session_state.last_save_time = datetime.now()
+                            st.session_state.last_save_mono = time.monotonic()
+                            st.session_state.last_saved_hash = state_hash
+                            auto_save_text = t('progress_auto_saved')
+                            st.toast(auto_save_text, icon="💾")
+                        st.session_state.dirty = False
                     except Exception as e:
-                        logging.error(f"自动保存失败: {str(e)}")
+                        logging.error("自动保存失败: %s", e)
             
             except Exception as e:
                 st.error(f"渲染评估页面时出错: {str(e)}")
-                logging.error(f"渲染评估页面失败: {str(e)}")
-                logging.error(traceback.format_exc())
+                logging.exception("渲染评估页面失败: %s", e)
+
+        # 计算得分（结果分析与报告导出共用）
+        section_scores, question_scores = compute_scores(questionnaire, questionnaire_mtimes, st.session_state.responses, st.session_state.sub_responses)
+        total_score = calculate_total_score(section_scores)
 
         # 结果分析标签页
         with tabs[1]:
             try:
-                # 计算各部分得分
-                section_scores = {}
-                for section in questionnaire.keys():
-                    section_responses = {k: v for k, v in st.session_state.responses.items() if k.startswith(section)}
-                    section_sub_responses = {k: v for k, v in st.session_state.sub_responses.items() if k.startswith(section)}
-                    
-                    # 计算每个问题的得分
-                    question_scores = []
-                    questions = questionnaire[section].get('questions', {})
-                    for q_id, question in questions.items():
-                        key = f"{section}_{q_id}"
-                        if question["type"] == "PW":
-                            sub_keys = [k for k in section_sub_responses if k.startswith(key)]
-                            sub_count = len(sub_keys)
-                            weight = score_weights_config['question_weights'][section].get(q_id, 1)
-                            selected_count = sum(1 for k in sub_keys if section_sub_responses[k])
-                            score = (weight / sub_count) * selected_count if sub_count else 0
-                        elif key in section_responses:
-                            score = calculate_compliance_score(
-                                section_responses[key],
-                                question["type"],
-                                None,
-                                score_weight=score_weights_config['question_weights'][section].get(q_id, 1)
-                            )
-                        else:
-                            score = 0
-                        question_scores.append(score)
-                    
-                    # 计算要素总分（由平均分改为总和）
-                    section_scores[section] = sum(question_scores) if question_scores else 0
-                
                 # 显示总体合规分数
                 col1, col2, col3 = st.columns([1, 2, 1])
                 with col2:
                     # 只显示1000分制得分
-                    total_score = calculate_total_score(section_scores)
                     st.metric(
-                        config.lang_zh['overall_score'] if st.session_state.language == 'zh' else config.lang_en['overall_score'],
+                        t('overall_score'),
                         f"{total_score:.1f}/1000"
                     )
                 
                 # 显示雷达图
-                radar_chart = create_radar_chart(section_scores)
+                radar_chart = create_radar_chart(section_scores, st.session_state.language)
                 if radar_chart:
                     st.plotly_chart(radar_chart, use_container_width=True)
                 else:
-                    st.warning(config.lang_en['cannot_generate_radar_chart'] if st.session_state.language == 'en' else config.lang_zh['cannot_generate_radar_chart'])
+                    st.warning(t('cannot_generate_radar_chart'))
                 # 显示详细得分（去除百分比进度条，仅保留分数）
-                st.subheader(config.lang_zh['element_scores'] if st.session_state.language == 'zh' else config.lang_en['element_scores'])
+                st.subheader(t('element_scores'))
                 cols = st.columns(3)
                 for i, (section, score) in enumerate(section_scores.items()):
                     with cols[i % 3]:
-                        section_name = questionnaire[section]['name'][st.session_state.language]
-                        st.metric(section_name, f"{score:.1f}")
+                        st.metric(section_names[section], f"{score:.1f}")
             
             except Exception as e:
                 st.error(f"渲染结果分析页面时出错: {str(e)}")
-                logging.error(f"渲染结果分析页面失败: {str(e)}")
-                logging.error(traceback.format_exc())
+                logging.exception("渲染结果分析页面失败: %s", e)
 
         # 报告导出标签页
         with tabs[2]:
             try:
                 col1, col2 = st.columns(2)
                 with col1:
-                    excel_btn_text = config.lang_zh['generate_excel_report'] if st.session_state.language == 'zh' else config.lang_en['generate_excel_report']
+                    excel_btn_text = t('generate_excel_report')
                     if st.button(excel_btn_text, key="generate_excel_report"):
-                        with st.spinner(config.lang_zh['generating_excel_report'] if st.session_state.language == 'zh' else config.lang_en['generating_excel_report']):
-                            # 创建报告数据
-                            report_data = []
-                            for section, section_data in questionnaire.items():
-                                section_id = section_data.get('id', section)
-                                for q_id, question in section_data.get('questions', {}).items():
-                                    key = f"{section}_{q_id}"
-                                    score = st.session_state.responses.get(key, 0)
-                                    question_weight = score_weights_config['question_weights'][section].get(q_id, 1)
-                                    if question["type"] == "XO":
-                                        actual_score = question_weight if score == 4 else 0
-                                    elif question["type"] == "PJ":
-                                        actual_score = question_weight * (score / 4)
-                                    elif question["type"] == "PW":
-                                        # 重新计算PW题的得分
-                                        sub_questions = question.get("sub_questions", {}).get(st.session_state.language, [])
-                                        sub_count = len(sub_questions)
-                                        selected_count = 0
-                                        for i in range(1, sub_count + 1):
-                                            sub_key = f"{key}_sub_{i}"
-                                            if st.session_state.sub_responses.get(sub_key, False):
-                                                selected_count += 1
-                                        actual_score = (question_weight / sub_count) * selected_count if sub_count else 0
-                                    else:
-                                        actual_score = score
-                                    # 获取子问题得分（如果是多选题）
-                                    sub_scores = []
-                                    if question["type"] == "PW" and "sub_questions" in question:
-                                        sub_questions = question["sub_questions"].get(st.session_state.language, [])
-                                        for i, sub_q in enumerate(sub_questions, 1):
-                                            sub_key = f"{key}_sub_{i}"
-                                            sub_score = st.session_state.sub_responses.get(sub_key, 0)
-                                            sub_scores.append({
-                                                "sub_question": sub_q,
-                                                "score": "Yes" if sub_score == 4 else "No" if st.session_state.language == 'en' else "是" if sub_score == 4 else "否"
-                                            })
-                                    score_labels = {
-                                        'zh': {
-                                            0: "未实施",
-                                            1: "初步实施",
-                                            2: "部分实施",
-                                            3: "大部分实施",
-                                            4: "完全实施"
-                                        },
-                                        'en': {
-                                            0: "Not Implemented",
-                                            1: "Initial Implementation",
-                                            2: "Partial Implementation",
-                                            3: "Mostly Implemented",
-                                            4: "Fully Implemented"
-                                        }
-                                    }
-                                    report_data.append({
-                                        "element": section_id,
-                                        "question_type": question["type"],
-                                        "question": get_translated_text(question["description"], st.session_state.language),
-                                        "score": actual_score,
-                                        "assessment": score_labels[st.session_state.language][round(score)] if question["type"] != "XO" else 
-                                                    ("Yes" if score == 4 else "No" if st.session_state.language == 'en' else "是" if score == 4 else "否"),
-                                        "weight": score_weights_config['question_weights'][section].get(q_id, 1),
-                                        "sub_scores": sub_scores if sub_scores else None
-                                    })
-                            
-                            # 创建DataFrame并导出为Excel
-                            df = pd.DataFrame(report_data)
+                        with st.spinner(t('generating_excel_report')):
                             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                             filename = f"ISO55013_{'Assessment_Report' if st.session_state.language == 'en' else '评估报告'}_{timestamp}.xlsx"
                             
                             try:
-                                with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-                                    sheet_name = config.lang_zh['assessment_results'] if st.session_state.language == 'zh' else config.lang_en['assessment_results']
-                                    df.to_excel(writer, index=False, sheet_name=sheet_name)
-                                    
-                                    # 创建雷达图数据工作表
-                                    radar_data = pd.DataFrame({
-                                        config.lang_zh['element'] if st.session_state.language == 'zh' else config.lang_en['element']: list(section_scores.keys()),
-                                        config.lang_zh['score'] if st.session_state.language == 'zh' else config.lang_en['score']: [f"{v:.1f}" for v in section_scores.values()]
-                                    })
-                                    radar_sheet_name = config.lang_zh['radar_chart_data'] if st.session_state.language == 'zh' else config.lang_en['radar_chart_data']
-                                    radar_data.to_excel(writer, index=False, sheet_name=radar_sheet_name)
+                                # 评估内容与语言未变化时直接复用上次生成的报告
+                                report_key = (get_responses_hash(st.session_state.responses, st.session_state.sub_responses), st.session_state.language, questionnaire_mtimes)
+                                last_excel = st.session_state.get('last_excel')
+                                if last_excel and last_excel[0] == report_key:
+                                    excel_bytes = last_excel[1]
+                                else:
+                                    excel_bytes = create_excel_report(section_scores, question_scores, questionnaire, st.session_state.responses, st.session_state.sub_responses)
+                                    st.session_state.last_excel = (report_key, excel_bytes)
                                 
                                 # 提供下载链接
-                                with open(filename, 'rb') as f:
-                                    download_label = config.lang_zh['download_excel_report'] if st.session_state.language == 'zh' else config.lang_en['download_excel_report']
-                                    st.download_button(
-                                        label=download_label,
-                                        data=f,
-                                        file_name=filename,
-                                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                                    )
-                                success_msg = config.lang_zh['excel_report_generated'] if st.session_state.language == 'zh' else config.lang_en['excel_report_generated']
+                                download_label = t('download_excel_report')
+                                st.download_button(
+                                    label=download_label,
+                                    data=excel_bytes,
+                                    file_name=filename,
+                                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                                )
+                                success_msg = t('excel_report_generated')
                                 st.success(success_msg)
                             except Exception as e:
-                                error_msg = config.lang_zh['error_generating_excel_report'] if st.session_state.language == 'zh' else config.lang_en['error_generating_excel_report']
+                                error_msg = t('error_generating_excel_report')
                                 st.error(error_msg)
-                                logging.error(error_msg)
-                                logging.error(traceback.format_exc())
+                                logging.exception(error_msg)
                 
                 with col2:
-                    pdf_btn_text = config.lang_zh['generate_pdf_report'] if st.session_state.language == 'zh' else config.lang_en['generate_pdf_report']
+                    pdf_btn_text = t('generate_pdf_report')
                     if st.button(pdf_btn_text, key="generate_pdf_report"):
-                        spinner_text = config.lang_zh['generating_pdf_report'] if st.session_state.language == 'zh' else config.lang_en['generating_pdf_report']
+                        spinner_text = t('generating_pdf_report')
                         with st.spinner(spinner_text):
-                            pdf_buffer = create_pdf_report(section_scores, questionnaire, st.session_state.responses, st.session_state.sub_responses)
-                            if pdf_buffer:
+                            # 评估内容与语言未变化时直接复用上次生成的报告
+                            report_key = (get_responses_hash(st.session_state.responses, st.session_state.sub_responses), st.session_state.language, questionnaire_mtimes)
+                            last_pdf = st.session_state.get('last_pdf')
+                            if last_pdf and last_pdf[0] == report_key:
+                                pdf_bytes = last_pdf[1]
+                            else:
+                                pdf_buffer = create_pdf_report(section_scores, question_scores, total_score, questionnaire, st.session_state.responses, st.session_state.sub_responses)
+                                pdf_bytes = pdf_buffer.getvalue() if pdf_buffer else None
+                                if pdf_bytes:
+                                    st.session_state.last_pdf = (report_key, pdf_bytes)
+                            if pdf_bytes:
                                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                                 filename = f"ISO55013_{'Assessment_Report' if st.session_state.language == 'en' else '评估报告'}_{timestamp}.pdf"
-                                download_label = config.lang_zh['download_pdf_report'] if st.session_state.language == 'zh' else config.lang_en['download_pdf_report']
+                                download_label = t('download_pdf_report')
                                 st.download_button(
                                     label=download_label,
-                                    data=pdf_buffer,
+                                    data=pdf_bytes,
                                     file_name=filename,
                                     mime="application/pdf"
                                 )
-                                success_msg = config.lang_zh['pdf_report_generated'] if st.session_state.language == 'zh' else config.lang_en['pdf_report_generated']
+                                success_msg = t('pdf_report_generated')
                                 st.success(success_msg)
                             else:
-                                error_msg = config.lang_zh['failed_generating_pdf_report'] if st.session_state.language == 'zh' else config.lang_en['failed_generating_pdf_report']
+                                error_msg = t('failed_generating_pdf_report')
                                 st.error(error_msg)
             
             except Exception as e:
                 st.error(f"生成报告时出错: {str(e)}")
-                logging.error(f"生成报告失败: {str(e)}")
-                logging.error(traceback.format_exc())
+                logging.exception("生成报告失败: %s", e)
     
     except Exception as e:
         st.error(f"应用运行出错: {str(e)}")
-        logging.error(f"应用运行失败: {str(e)}")
-        logging.error(traceback.format_exc())
+        logging.exception("应用运行失败: %s", e)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,12 +1,19 @@
 import yaml
 import os
+import logging
 
 CONFIG_DIR = 'config'
 
+# YAML解析器：优先使用libyaml的C实现
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+if not yaml.__with_libyaml__:
+    # 使用模块logger，避免在app.py配置日志前隐式调用basicConfig
+    logging.getLogger(__name__).warning("未检测到libyaml，YAML将使用纯Python解析器加载，请在部署环境中安装libyaml")
+
 def load_yaml(filename):
     path = os.path.join(CONFIG_DIR, filename)
-    with open(path, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
+    with open(path, 'rb') as f:
+        return yaml.load(f, Loader=YAML_LOADER)
 
 class Config:
     def __init__(self):
@@ -15,4 +22,5 @@ class Config:
         self.lang_en = load_yaml('lang_en.yaml')
         self.general = load_yaml('config.yaml')
 
+# 模块级单例：每个进程导入时解析一次，所有会话共享；修改配置文件后需重启应用
 config = Config() 
\ No newline at end of file
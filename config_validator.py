@@ -36,7 +36,7 @@ if __name__ == "__main__":
         'failed_generating_pdf_report', 'overall_score', 'element_scores', 'cannot_generate_radar_chart',
         'score', 'question', 'type', 'weight', 'sub_question_scores', 'answer_yes', 'answer_no',
         'progress_auto_saved', 'last_progress_loaded', 'error_saving_progress', 'error_loading_progress',
-        'element', 'element_scores_detail', 'detailed_assessment_results'
+        'element', 'element_scores_detail', 'detailed_assessment_results', 'current_element'
     ]
     try:
         validate_lang_config(lang_zh, lang_required_keys, "lang_zh.yaml")